@@ -1,13 +1,14 @@
 from streamlit_ace import st_ace
 from typing import Dict
 import streamlit as st
-import requests
+import pandas as pd
 import logging
 import json
 import sys
-import os
 from datetime import datetime
 
+from batch import API_URL, BATCH_MAX_WORKERS, analyze_payload, log_mode, parse_batch_file, run_batch
+
 # ==============================================================================
 # 1. CONFIGURAÇÃO DE LOGGING
 # ==============================================================================
@@ -34,34 +35,13 @@ st.set_page_config(page_title = "JusCash - UI", layout = "wide", page_icon = "
 #     logger.info(f"Ambiente Docker não encontrado. Usando Localhost: {API_URL}")
 
 
-API_URL = os.getenv("API_URL", "http://localhost:8000")
 logger.info(f"API URL configurada: {API_URL}")
 
 
 def send_request(data: Dict, api_key: str = None):
     """Envia requisição para a API com logging."""
-    headers = {"X-API-Key": api_key} if api_key else {}
-    
-    if api_key:
-        masked_key = f"{api_key[:3]}...{api_key[-4:]}" if len(api_key) > 10 else "***"
-        logger.info(f"Modo REAL ativado. Usando API Key: {masked_key}")
-    else:
-        logger.info("Modo SIMULAÇÃO ativado (Sem API Key fornecida).")
-
-    logger.info(f"Enviando processo {data.get('numeroProcesso', 'N/A')} para análise...")
-    
-    try:
-        # Timeout maior (30s) para LLMs
-        res = requests.post(f"{API_URL}/analyze", json = data, headers = headers, timeout = 30)
-        res.raise_for_status()
-        logger.info("Resposta da API recebida com sucesso (200 OK).")
-        return res.json()
-    except requests.exceptions.ConnectionError:
-        return {"error": "Backend indisponível. Verifique se a API está rodando."}
-    except requests.exceptions.HTTPError as e:
-        return {"error": f"Erro da API ({res.status_code}): {res.text}"}
-    except Exception as e:
-        return {"error": str(e)}
+    log_mode(api_key)
+    return analyze_payload(data, api_key)
 
 # ==============================================================================
 # 3. INTERFACE (UI)
@@ -95,7 +75,7 @@ with col1:
         #st.divider()
 
     # Abas
-    tab_json, tab_form, tab_upload = st.tabs(["**💻 Editor JSON**", "**📝 Formulário Completo**", " **📂 Upload Arquivo**"])
+    tab_json, tab_form, tab_upload, tab_batch = st.tabs(["**💻 Editor JSON**", "**📝 Formulário Completo**", " **📂 Upload Arquivo**", "**📦 Lote**"])
 
     # --- LÓGICA DE INICIALIZAÇÃO ---
     if 'json_input_content' not in st.session_state:
@@ -254,6 +234,36 @@ with col1:
             except Exception as e:
                 st.error(f"Erro: {str(e)}")
 
+    # --- ABA 4: LOTE ---
+    with tab_batch:
+        st.markdown("Envie vários processos de uma vez: **array JSON** ou **JSONL** (um processo por linha).")
+        batch_file = st.file_uploader("Carregar arquivo de lote", type=["json", "jsonl", "txt"], key = "upload_lote")
+        if BATCH_MAX_WORKERS > 1:
+            max_workers = st.slider("Requisições simultâneas", min_value = 1, max_value = BATCH_MAX_WORKERS, value = min(4, BATCH_MAX_WORKERS))
+        else:
+            max_workers = 1
+            st.caption("Requisições simultâneas: 1")
+
+        if batch_file is not None:
+            try:
+                processos = parse_batch_file(batch_file.getvalue().decode("utf-8-sig"))
+                st.success(f"{len(processos)} processo(s) carregado(s)!")
+
+                if processos and st.button("🚀 Analisar Lote", type = "primary", use_container_width = True):
+                    if api_key:
+                        st.toast("Modo REAL: Conectando à OpenAI...", icon = "🔑")
+                    else:
+                        st.toast("Modo SIMULAÇÃO: Usando regras locais.", icon = "🛠️")
+
+                    progresso = st.progress(0.0, text = "Analisando lote ...")
+
+                    def atualizar_progresso(concluidos: int, total: int):
+                        progresso.progress(concluidos / total, text = f"Analisados {concluidos}/{total} processos")
+
+                    st.session_state['batch_results'] = run_batch(processos, api_key, max_workers, atualizar_progresso)
+            except (ValueError, UnicodeDecodeError) as e:
+                st.error(f"Erro: {str(e)}")
+
 with col2:
     st.subheader("Resultado da Análise")
 
@@ -317,4 +327,39 @@ with col2:
         font_size = 16,
         height = 350,
         key = f"editor_saida_{st.session_state['run_id']}"
-    )
\ No newline at end of file
+    )
+
+# ==============================================================================
+# 4. RESULTADOS DO LOTE
+# ==============================================================================
+if st.session_state.get('batch_results'):
+    st.divider()
+    st.subheader("Resultados do Lote")
+
+    df = pd.DataFrame(st.session_state['batch_results'])
+
+    f1, f2 = st.columns(2)
+    filtro_resultado = f1.multiselect("Filtrar por decisão", sorted(df["resultado"].unique()))
+    filtro_numero = f2.text_input("Filtrar por número do processo")
+
+    if filtro_resultado:
+        df = df[df["resultado"].isin(filtro_resultado)]
+    if filtro_numero:
+        df = df[df["numeroProcesso"].astype(str).str.contains(filtro_numero, case = False, regex = False, na = False)]
+
+    contagem = df["resultado"].value_counts()
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("✅ Aprovados", int(contagem.get("approved", 0)))
+    m2.metric("❌ Rejeitados", int(contagem.get("rejected", 0)))
+    m3.metric("⚠️ Incompletos", int(contagem.get("incomplete", 0)))
+    m4.metric("🚫 Erros", int(contagem.get("error", 0)))
+
+    st.dataframe(df, use_container_width = True, hide_index = True)
+
+    st.download_button(
+        "⬇️ Exportar CSV",
+        data = df.to_csv(index = False).encode("utf-8"),
+        file_name = f"juscash_lote_{datetime.now():%Y%m%d_%H%M%S}.csv",
+        mime = "text/csv",
+        use_container_width = True
+    )
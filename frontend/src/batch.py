@@ -0,0 +1,177 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, List, Optional
+import streamlit as st
+import threading
+import requests
+import logging
+import json
+import os
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+logger = logging.getLogger("juscash-ui")
+
+# ==============================================================================
+# 1. CONFIGURAÇÃO
+# ==============================================================================
+API_URL = os.getenv("API_URL", "http://localhost:8000")
+
+DEFAULT_BATCH_MAX_WORKERS = 8
+
+
+def _read_max_workers() -> int:
+    """Lê BATCH_MAX_WORKERS do ambiente, garantindo um inteiro >= 1."""
+    valor = os.getenv("BATCH_MAX_WORKERS", str(DEFAULT_BATCH_MAX_WORKERS))
+    try:
+        return max(1, int(valor))
+    except ValueError:
+        logger.warning(f"BATCH_MAX_WORKERS inválido ({valor!r}). Usando {DEFAULT_BATCH_MAX_WORKERS}.")
+        return DEFAULT_BATCH_MAX_WORKERS
+
+
+# Limite de requisições simultâneas no modo Lote (também dimensiona o pool HTTP)
+BATCH_MAX_WORKERS = _read_max_workers()
+
+# Indica, por thread, se a última chamada a analyze_cached de fato acionou a API
+_estado_thread = threading.local()
+
+# ==============================================================================
+# 2. CLIENTE HTTP
+# ==============================================================================
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Sessão HTTP compartilhada (keep-alive) com pool de conexões para a API."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections = 1, pool_maxsize = BATCH_MAX_WORKERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(show_spinner = False, max_entries = 1000)
+def analyze_cached(payload_json: str, api_key: Optional[str] = None) -> Dict:
+    """
+    Envia o payload (JSON serializado) para a API e devolve a resposta.
+    Apenas respostas de sucesso são cacheadas: erros viram exceção e não entram no cache.
+    """
+    _estado_thread.chamou_api = True
+    headers = {"X-API-Key": api_key} if api_key else {}
+    res = get_http_session().post(
+        f"{API_URL}/analyze",
+        data = payload_json.encode("utf-8"),
+        headers = {**headers, "Content-Type": "application/json"},
+        timeout = 30  # Timeout maior (30s) para LLMs
+    )
+    res.raise_for_status()
+    return res.json()
+
+
+def log_mode(api_key: Optional[str] = None):
+    """Registra o modo de operação (REAL/SIMULAÇÃO) com a API Key mascarada."""
+    if api_key:
+        masked_key = f"{api_key[:3]}...{api_key[-4:]}" if len(api_key) > 10 else "***"
+        logger.info(f"Modo REAL ativado. Usando API Key: {masked_key}")
+    else:
+        logger.info("Modo SIMULAÇÃO ativado (Sem API Key fornecida).")
+
+
+def analyze_payload(data: Dict, api_key: Optional[str] = None) -> Dict:
+    """Analisa um processo (com cache), convertendo falhas em {"error": ...}."""
+    logger.info(f"Enviando processo {data.get('numeroProcesso', 'N/A')} para análise...")
+    _estado_thread.chamou_api = False
+
+    try:
+        resp = analyze_cached(json.dumps(data, sort_keys = True, ensure_ascii = False), api_key)
+    except requests.exceptions.ConnectionError:
+        return {"error": "Backend indisponível. Verifique se a API está rodando."}
+    except requests.exceptions.HTTPError as e:
+        return {"error": f"Erro da API ({e.response.status_code}): {e.response.text}"}
+    except Exception as e:
+        return {"error": str(e)}
+
+    if _estado_thread.chamou_api:
+        logger.info("Resposta da API recebida com sucesso (200 OK).")
+    else:
+        logger.info("Resposta reaproveitada do cache (payload já analisado).")
+    return resp
+
+# ==============================================================================
+# 3. MODO LOTE
+# ==============================================================================
+def parse_batch_file(content: str) -> List[Dict]:
+    """Lê um arquivo de lote em formato JSON (array ou objeto único) ou JSONL (um processo por linha)."""
+    content = content.strip()
+    if not content:
+        return []
+
+    try:
+        parsed = json.loads(content)
+    except json.JSONDecodeError as e:
+        if content.startswith("["):
+            # Array JSON malformado: reporta o erro original em vez de tentar JSONL
+            raise ValueError(f"JSON inválido (linha {e.lineno}, coluna {e.colno}): {e.msg}")
+
+        # Não é um JSON único: tenta JSONL
+        parsed = []
+        for num_linha, linha in enumerate(content.splitlines(), start = 1):
+            if not linha.strip():
+                continue
+            try:
+                parsed.append(json.loads(linha))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Linha {num_linha} inválida: {e.msg}")
+
+    if isinstance(parsed, dict):
+        parsed = [parsed]
+    if not isinstance(parsed, list) or not all(isinstance(item, dict) for item in parsed):
+        raise ValueError("O arquivo deve conter um array JSON de processos ou um processo por linha (JSONL).")
+    return parsed
+
+
+def _build_row(idx: int, processo: Dict, resp: Dict) -> Dict:
+    """Monta a linha da tabela de resultados para um processo."""
+    return {
+        "#": idx + 1,
+        "numeroProcesso": str(processo.get("numeroProcesso", "N/A")),
+        "resultado": resp.get("resultado", "error") if "error" not in resp else "error",
+        "justificativa": resp.get("justificativa", resp.get("error", "")),
+        "citacoes": ", ".join(resp.get("citacoes", [])),
+    }
+
+
+def run_batch(processos: List[Dict], api_key: Optional[str] = None, max_workers: int = BATCH_MAX_WORKERS,
+              on_progress: Optional[Callable[[int, int], None]] = None) -> List[Dict]:
+    """
+    Analisa os processos em paralelo (concorrência limitada) sobre a sessão HTTP compartilhada.
+    `on_progress(concluidos, total)` é chamado na thread do script a cada resultado recebido.
+    Os resultados são devolvidos na mesma ordem da entrada.
+    """
+    total = len(processos)
+    resultados: List[Dict] = [None] * total
+    log_mode(api_key)
+    logger.info(f"Iniciando lote com {total} processo(s) e até {max_workers} requisições simultâneas.")
+
+    # Propaga o contexto do script para as threads de trabalho (exigido pelo cache do Streamlit)
+    ctx = get_script_run_ctx()
+    executor = ThreadPoolExecutor(
+        max_workers = max(1, max_workers),
+        initializer = (lambda: add_script_run_ctx(threading.current_thread(), ctx)) if ctx else None
+    )
+
+    try:
+        futures = {executor.submit(analyze_payload, processo, api_key): idx for idx, processo in enumerate(processos)}
+        for concluidos, future in enumerate(as_completed(futures), start = 1):
+            idx = futures[future]
+            resultados[idx] = _build_row(idx, processos[idx], future.result())
+            if on_progress:
+                on_progress(concluidos, total)
+    except BaseException:
+        # Rerun/Stop do Streamlit (ou qualquer falha): descarta o trabalho pendente sem esperar
+        logger.info("Lote interrompido. Cancelando requisições pendentes.")
+        executor.shutdown(wait = False, cancel_futures = True)
+        raise
+
+    executor.shutdown()
+    logger.info(f"Lote finalizado: {total} processo(s) analisado(s).")
+    return resultados
@@ -0,0 +1,151 @@
+from frontend.src import batch
+import requests
+import pytest
+import json
+import time
+import threading
+
+# ==============================================================================
+# HTTP FALSO (sem backend)
+# ==============================================================================
+def make_response(status_code, body):
+    res = requests.Response()
+    res.status_code = status_code
+    res._content = json.dumps(body).encode("utf-8") if not isinstance(body, bytes) else body
+    return res
+
+class FakeSession:
+    """Substitui a requests.Session: decide a resposta a partir do payload enviado."""
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def post(self, url, data=None, headers=None, timeout=None):
+        with self.lock:
+            self.calls += 1
+        return self.handler(json.loads(data.decode("utf-8")))
+
+def decisao_ok(payload):
+    return make_response(200, {"resultado": "approved", "justificativa": "OK", "citacoes": ["POL-1", "POL-2"]})
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    def install(handler=decisao_ok):
+        session = FakeSession(handler)
+        monkeypatch.setattr(batch, "get_http_session", lambda: session)
+        return session
+    batch.analyze_cached.clear()
+    yield install
+    batch.analyze_cached.clear()
+
+# ==============================================================================
+# parse_batch_file
+# ==============================================================================
+def test_parse_array_json():
+    assert batch.parse_batch_file('[{"numeroProcesso": "1"}, {"numeroProcesso": "2"}]') == [
+        {"numeroProcesso": "1"}, {"numeroProcesso": "2"}
+    ]
+
+def test_parse_objeto_unico():
+    assert batch.parse_batch_file('{"numeroProcesso": "1"}') == [{"numeroProcesso": "1"}]
+
+def test_parse_jsonl_ignora_linhas_em_branco():
+    conteudo = '{"numeroProcesso": "1"}\n\n   \n{"numeroProcesso": "2"}\n'
+    assert batch.parse_batch_file(conteudo) == [{"numeroProcesso": "1"}, {"numeroProcesso": "2"}]
+
+def test_parse_vazio():
+    assert batch.parse_batch_file("  \n ") == []
+
+def test_parse_jsonl_erro_indica_linha():
+    with pytest.raises(ValueError, match="Linha 3 inválida"):
+        batch.parse_batch_file('{"a": 1}\n{"a": 2}\n{"a": ')
+
+def test_parse_array_malformado_nao_cai_para_jsonl():
+    with pytest.raises(ValueError, match="JSON inválido") as exc:
+        batch.parse_batch_file('[{"a": 1},]')
+    assert "Linha" not in str(exc.value)
+
+def test_parse_rejeita_itens_que_nao_sao_objetos():
+    with pytest.raises(ValueError, match="array JSON de processos"):
+        batch.parse_batch_file('[1, 2, 3]')
+
+# ==============================================================================
+# run_batch
+# ==============================================================================
+def test_run_batch_preserva_ordem_e_reporta_progresso(fake_session):
+    def handler(payload):
+        # Processos com índice menor demoram mais: terminam fora de ordem
+        time.sleep(0.01 * (5 - int(payload["numeroProcesso"])))
+        return decisao_ok(payload)
+    fake_session(handler)
+
+    processos = [{"numeroProcesso": str(i)} for i in range(5)]
+    progresso = []
+    resultados = batch.run_batch(processos, max_workers=5, on_progress=lambda c, t: progresso.append((c, t)))
+
+    assert [r["numeroProcesso"] for r in resultados] == ["0", "1", "2", "3", "4"]
+    assert [r["#"] for r in resultados] == [1, 2, 3, 4, 5]
+    assert resultados[0]["resultado"] == "approved"
+    assert resultados[0]["citacoes"] == "POL-1, POL-2"
+    assert progresso == [(i, 5) for i in range(1, 6)]
+
+def test_run_batch_monta_linhas_de_erro(fake_session):
+    def handler(payload):
+        if payload["numeroProcesso"] == "offline":
+            raise requests.exceptions.ConnectionError()
+        if payload["numeroProcesso"] == "quebrado":
+            return make_response(500, b"boom")
+        return decisao_ok(payload)
+    fake_session(handler)
+
+    resultados = batch.run_batch(
+        [{"numeroProcesso": "offline"}, {"numeroProcesso": "quebrado"}, {"numeroProcesso": "ok"}],
+        max_workers=2
+    )
+
+    assert [r["resultado"] for r in resultados] == ["error", "error", "approved"]
+    assert "Backend indisponível" in resultados[0]["justificativa"]
+    assert "Erro da API (500): boom" in resultados[1]["justificativa"]
+    assert resultados[0]["citacoes"] == ""
+
+def test_run_batch_numero_processo_sempre_texto(fake_session):
+    fake_session()
+    resultados = batch.run_batch([{"numeroProcesso": 123}, {"numeroProcesso": None}, {}], max_workers=1)
+    assert [r["numeroProcesso"] for r in resultados] == ["123", "None", "N/A"]
+
+def test_run_batch_reaproveita_cache_para_payload_repetido(fake_session):
+    session = fake_session()
+    processo = {"numeroProcesso": "1", "esfera": "Federal"}
+
+    batch.run_batch([processo], max_workers=1)
+    batch.run_batch([dict(reversed(list(processo.items())))], max_workers=1)
+
+    assert session.calls == 1
+
+def test_run_batch_erros_nao_sao_cacheados(fake_session):
+    session = fake_session(lambda payload: make_response(502, b"falha"))
+    batch.run_batch([{"numeroProcesso": "1"}], max_workers=1)
+    batch.run_batch([{"numeroProcesso": "1"}], max_workers=1)
+    assert session.calls == 2
+
+def test_run_batch_interrompido_descarta_pendentes(fake_session):
+    class RerunSimulado(BaseException):
+        pass
+
+    def handler(payload):
+        time.sleep(0.05)
+        return decisao_ok(payload)
+    session = fake_session(handler)
+
+    def interrompe(concluidos, total):
+        raise RerunSimulado()
+
+    inicio = time.monotonic()
+    with pytest.raises(RerunSimulado):
+        batch.run_batch([{"numeroProcesso": str(i)} for i in range(50)], max_workers=2, on_progress=interrompe)
+
+    # Não espera os 50 processos (~1,25 s com 2 workers)
+    assert time.monotonic() - inicio < 0.5
+    time.sleep(0.2)
+    assert session.calls < 50